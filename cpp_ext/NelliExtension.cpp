@@ -129,12 +129,20 @@ PYBIND11_MODULE(_nelli_mlir, m) {
           }
         });
 
-  m.def("walk_operation", [](PyOperation &self,
-                             std::function<void(MlirOperation)> callback) {
-    unwrap(self.get())->walk<WalkOrder::PreOrder>([&callback](Operation *op) {
-      callback(wrap(op));
-    });
-  });
+  m.def(
+      "walk_operation",
+      [](PyOperation &self, std::function<void(MlirOperation)> callback,
+         const std::string &opName) {
+        // filter on the op name here so non-matching ops never cross into
+        // python
+        unwrap(self.get())->walk<WalkOrder::PreOrder>(
+            [&callback, &opName](Operation *op) {
+              if (!opName.empty() && op->getName().getStringRef() != opName)
+                return;
+              callback(wrap(op));
+            });
+      },
+      py::arg("op"), py::arg("callback"), py::arg("op_name") = "");
 
   m.def("get_affine_map_from_attr", [](PyAttribute &self) {
     auto aff_map =
@@ -306,6 +314,7 @@ PYBIND11_MODULE(_nelli_mlir, m) {
 
   nelli::registerAddOuterParallelLoopPass();
   nelli::registerBufferHostRegisterPass();
+  nelli::registerConvertForallToForPass();
   nelli::registerGeneralizeTensorPadPass();
   nelli::registerGPUXToSPIRVPass();
   nelli::registerInsertGPUAllocsPass();
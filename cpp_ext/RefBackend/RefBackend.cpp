@@ -8,11 +8,14 @@
 
 #include "RefBackend.h"
 #include "mlir/Dialect/Arith/IR/Arith.h"
+#include "mlir/Dialect/Arith/Utils/Utils.h"
 #include "mlir/Dialect/Func/IR/FuncOps.h"
 #include "mlir/Dialect/Linalg/IR/Linalg.h"
 #include "mlir/Dialect/Linalg/Transforms/Transforms.h"
 #include "mlir/Dialect/MemRef/IR/MemRef.h"
+#include "mlir/Dialect/SCF/IR/SCF.h"
 #include "mlir/Dialect/Utils/StructuredOpsUtils.h"
+#include "mlir/IR/IRMapping.h"
 #include "mlir/IR/Operation.h"
 #include "mlir/Pass/Pass.h"
 #include "mlir/Pass/PassManager.h"
@@ -355,10 +358,65 @@ struct GeneralizeTensorPad
     }
   }
 };
+
+// Rewrites each scf.forall into a serial nest of scf.for loops, for CPU
+// lowerings that run the forall on a single thread; only the bufferized form
+// (no shared_outs) is handled, since the tensor form would need its
+// parallel_insert_slices threaded through iter_args.
+struct ConvertForallToFor
+    : public PassWrapper<ConvertForallToFor, OperationPass<func::FuncOp>> {
+
+  MLIR_DEFINE_EXPLICIT_INTERNAL_INLINE_TYPE_ID(ConvertForallToFor)
+
+  void getDependentDialects(DialectRegistry &registry) const override {
+    registry.insert<arith::ArithDialect, scf::SCFDialect>();
+  }
+  [[nodiscard]] StringRef getArgument() const final {
+    return "refbackend-convert-forall-to-for";
+  }
+
+  void runOnOperation() override {
+    // post-order, so nested foralls are rewritten before their parents clone
+    // them
+    SmallVector<scf::ForallOp> forallOps;
+    getOperation().walk([&](scf::ForallOp forallOp) {
+      if (forallOp.getOutputs().empty())
+        forallOps.push_back(forallOp);
+    });
+
+    IRRewriter rewriter(&getContext());
+    for (scf::ForallOp forallOp : forallOps) {
+      Location loc = forallOp.getLoc();
+      rewriter.setInsertionPoint(forallOp);
+      SmallVector<Value> lbs = getValueOrCreateConstantIndexOp(
+          rewriter, loc, forallOp.getMixedLowerBound());
+      SmallVector<Value> ubs = getValueOrCreateConstantIndexOp(
+          rewriter, loc, forallOp.getMixedUpperBound());
+      SmallVector<Value> steps = getValueOrCreateConstantIndexOp(
+          rewriter, loc, forallOp.getMixedStep());
+      scf::LoopNest loopNest =
+          scf::buildLoopNest(rewriter, loc, lbs, ubs, steps);
+
+      SmallVector<Value> ivs;
+      for (scf::ForOp forOp : loopNest.loops)
+        ivs.push_back(forOp.getInductionVar());
+      IRMapping mapping;
+      mapping.map(forallOp.getInductionVars(), ivs);
+      rewriter.setInsertionPoint(
+          loopNest.loops.back().getBody()->getTerminator());
+      for (Operation &op : forallOp.getBody()->without_terminator())
+        rewriter.clone(op, mapping);
+      rewriter.eraseOp(forallOp);
+    }
+  }
+};
 } // namespace
 
 namespace nelli {
 void registerGeneralizeTensorPadPass() {
   PassRegistration<GeneralizeTensorPad>();
 }
+void registerConvertForallToForPass() {
+  PassRegistration<ConvertForallToFor>();
+}
 } // namespace nelli
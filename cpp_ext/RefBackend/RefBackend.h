@@ -14,6 +14,7 @@ namespace nelli {
 void registerMungeCallingConventionPass();
 void registerMungeMemrefCopyPass();
 void registerGeneralizeTensorPadPass();
+void registerConvertForallToForPass();
 } // namespace nelli
 
 #endif // NELLI_REFBACKEND_H
@@ -1,6 +1,7 @@
 from .affine import (
     Apply,
     affine_range,
+    affine_for,
     end_for,
     LoadOp,
     StoreOp,
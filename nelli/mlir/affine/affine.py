@@ -1,3 +1,4 @@
+import contextlib
 from typing import Optional, Union, Sequence
 
 from . import _affine_ops_gen as affine
@@ -5,13 +6,10 @@ from ._affine_ops_gen import _Dialect
 from ..annot import Annot
 from ..arith import ArithValue, constant
 from ..memref import MemRefValue, AllocaOp
+from ..utils import as_value
 
 # noinspection PyUnresolvedReferences
 from .._mlir.dialects._ods_common import _cext
-from .._mlir.dialects._ods_common import (
-    get_op_result_or_value,
-    get_op_results_or_values,
-)
 from .._mlir.ir import (
     AffineMap,
     AffineMapAttr,
@@ -22,6 +20,7 @@ from .._mlir.ir import (
     MemRefType,
     UnrankedMemRefType,
     Attribute,
+    Context,
     OpView,
     Operation,
     Value,
@@ -29,6 +28,31 @@ from .._mlir.ir import (
 )
 
 
+# keyed on the Context itself; the cached attrs keep their context alive, so
+# reset_disambig_names/mlir_gc clear this
+_IDENTITY_MAP_ATTR_CACHE: dict[tuple[Context, int], AffineMapAttr] = {}
+
+
+def _identity_attr(n_dims: int) -> AffineMapAttr:
+    key = Context.current, n_dims
+    map_attr = _IDENTITY_MAP_ATTR_CACHE.get(key)
+    if map_attr is None:
+        map_attr = _IDENTITY_MAP_ATTR_CACHE[key] = AffineMapAttr.get(
+            AffineMap.get_identity(n_dims=n_dims)
+        )
+    return map_attr
+
+
+def _resolve_indices(indices) -> list[Value]:
+    # single pass: materialize int indices as constants and resolve the rest
+    if indices is None:
+        return []
+    return [
+        constant(i, index=True) if isinstance(i, int) else as_value(i)
+        for i in indices
+    ]
+
+
 @_cext.register_operation(_Dialect)
 class AffineForOp(OpView):
     OPERATION_NAME = "affine.for"
@@ -49,8 +73,8 @@ class AffineForOp(OpView):
             "upper_bound": AffineMapAttr.get(AffineMap.get_constant(upper_bound)),
             "step": IntegerAttr.get(IntegerType.get_signless(64), step),
         }
-
-        results = []
+        # affine.for has custom builders in ODS so the generated class has no
+        # typed __init__ to defer to; build_generic is the only way in.
         super().__init__(
             self.build_generic(
                 regions=1,
@@ -61,7 +85,7 @@ class AffineForOp(OpView):
                 ip=ip,
             )
         )
-        self.regions[0].blocks.append(IndexType.get(), *results)
+        self.regions[0].blocks.append(IndexType.get())
 
     @property
     def results_(self):
@@ -100,15 +124,12 @@ class LoadOp(affine.AffineLoadOp):
         loc=None,
         ip=None,
     ):
-        if isinstance(indices, tuple):
-            indices = list(indices)
-        memref_resolved = get_op_result_or_value(memref)
-        for idx, i in enumerate(indices):
-            if isinstance(i, int):
-                indices[idx] = constant(i, index=True)
-        indices_resolved = [] if indices is None else get_op_results_or_values(indices)
-        return_type = MemRefType(memref_resolved.type).element_type
-        map = AffineMapAttr.get(AffineMap.get_identity(n_dims=len(indices)))
+        memref_resolved = as_value(memref)
+        indices_resolved = _resolve_indices(indices)
+        return_type = getattr(memref, "_element_type", None)
+        if return_type is None:
+            return_type = MemRefType(memref_resolved.type).element_type
+        map = _identity_attr(len(indices_resolved))
         super().__init__(
             return_type, memref_resolved, indices_resolved, map=map, loc=loc, ip=ip
         )
@@ -124,54 +145,51 @@ class StoreOp(affine.AffineStoreOp):
         loc=None,
         ip=None,
     ):
-        if isinstance(indices, tuple):
-            indices = list(indices)
-        value_resolved = get_op_result_or_value(value)
-        for idx, i in enumerate(indices):
-            if isinstance(i, int):
-                indices[idx] = constant(i, index=True)
-        map = AffineMapAttr.get(AffineMap.get_identity(n_dims=len(indices)))
-
-        operands = [value_resolved]
-        results = []
-        attributes = {"map": map}
-        regions = None
-        operands.append(get_op_result_or_value(memref))
-        operands.extend(get_op_results_or_values(indices))
-        _ods_successors = None
+        memref_resolved = as_value(memref)
+        value_resolved = as_value(value)
+        indices_resolved = _resolve_indices(indices)
+        map = _identity_attr(len(indices_resolved))
+
+        # same as affine.for: no generated typed __init__ for affine.store
         super().__init__(
             self.build_generic(
-                attributes=attributes,
-                results=results,
-                operands=operands,
-                successors=_ods_successors,
-                regions=regions,
+                attributes={"map": map},
+                results=[],
+                operands=[value_resolved, memref_resolved, *indices_resolved],
                 loc=loc,
                 ip=ip,
             )
         )
 
 
-_for_ip = None
+_for_ips: list[InsertionPoint] = []
 
 
 def affine_range(start, stop=None, step=1):
-    global _for_ip
-
     if stop is None:
         stop = start
         start = 0
 
     for_op = AffineForOp(start, stop, step)
-    _for_ip = InsertionPoint(for_op.body)
-    _for_ip.__enter__()
+    ip = InsertionPoint(for_op.body)
+    ip.__enter__()
+    # stack (rather than a single global) so that nested loops unwind correctly
+    _for_ips.append(ip)
     return [ArithValue(for_op.induction_variable)]
 
 
 def end_for():
     affine.AffineYieldOp([])
-    global _for_ip
-    _for_ip.__exit__(None, None, None)
+    _for_ips.pop().__exit__(None, None, None)
+
+
+@contextlib.contextmanager
+def affine_for(start, stop=None, step=1):
+    (iv,) = affine_range(start, stop, step)
+    try:
+        yield iv
+    finally:
+        end_for()
 
 
 def store(
@@ -25,7 +25,7 @@ from .arith import ArithValue, constant
 from .func import MLIRFunc
 from .module import Module
 from .scf import scf_range
-from .utils import doublewrap
+from .utils import paramized_wrap
 from ..mlir._mlir.dialects import gpu
 
 
@@ -161,7 +161,7 @@ class LaunchOp(gpu.LaunchOp):
         return self.entry_block.arguments
 
 
-@doublewrap
+@paramized_wrap
 def gpu_launch(f, grid_size, block_size):
     grid_size_, block_size_ = [1] * 3, [1] * 3
     grid_size_[: len(grid_size)], block_size_[: len(grid_size)] = grid_size, block_size
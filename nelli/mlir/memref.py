@@ -9,14 +9,11 @@ from typing import (
 from ._mlir._mlir_libs._mlir.ir import Attribute, ShapedType
 from .annot import Annot
 from .arith import ArithValue, constant
+from .utils import as_value, as_values
 
 # noinspection PyUnresolvedReferences
 from ..mlir._mlir._mlir_libs._nelli_mlir import MemRefValue
 from ..mlir._mlir.dialects import memref
-from ..mlir._mlir.dialects._ods_common import (
-    get_op_result_or_value,
-    get_op_results_or_values,
-)
 from ..mlir._mlir.ir import (
     Type,
     Value,
@@ -49,14 +46,27 @@ class StoreOp(memref.StoreOp):
         loc=None,
         ip=None,
     ):
-        memref_resolved = get_op_result_or_value(memref)
-        value_resolved = get_op_result_or_value(value)
-        indices_resolved = [] if indices is None else get_op_results_or_values(indices)
+        memref_resolved = as_value(memref)
+        value_resolved = as_value(value)
+        indices_resolved = [] if indices is None else as_values(indices)
         super().__init__(
             value_resolved, memref_resolved, indices_resolved, loc=loc, ip=ip
         )
 
 
+def _memref_type(dim_sizes, el_type: Optional[Type]) -> MemRefType:
+    assert dim_sizes and isinstance(dim_sizes[0], int)
+    if el_type is None:
+        # not cached at module scope since types are uniqued per context
+        el_type = F64Type.get()
+
+    # TODO(max): this goes in dynamic/symbolic sizes
+    # if isinstance(dim_sizes[0], (Operation, OpView, Value)):
+    #     dim_sizes = [] if dim_sizes is None else _get_op_results_or_values(dim_sizes)
+
+    return MemRefType.get(dim_sizes, el_type)
+
+
 class AllocaOp(memref.AllocaOp):
     def __init__(
         self,
@@ -66,17 +76,7 @@ class AllocaOp(memref.AllocaOp):
         loc=None,
         ip=None,
     ):
-        if el_type is None:
-            el_type = F64Type.get()
-        assert dim_sizes
-        assert isinstance(dim_sizes[0], int)
-
-        # TODO(max): this goes in dynamic/symbolic sizes
-        # if isinstance(dim_sizes[0], (Operation, OpView, Value)):
-        #     dim_sizes = [] if dim_sizes is None else _get_op_results_or_values(dim_sizes)
-
-        res_type = MemRefType.get(dim_sizes, el_type)
-        super().__init__(res_type, [], [], loc=loc, ip=ip)
+        super().__init__(_memref_type(dim_sizes, el_type), [], [], loc=loc, ip=ip)
 
 
 class AllocOp(memref.AllocOp):
@@ -88,21 +88,22 @@ class AllocOp(memref.AllocOp):
         loc=None,
         ip=None,
     ):
-        if el_type is None:
-            el_type = F64Type.get()
-        assert dim_sizes
-        assert isinstance(dim_sizes[0], int)
+        super().__init__(_memref_type(dim_sizes, el_type), [], [], loc=loc, ip=ip)
 
-        # TODO(max): this goes in dynamic/symbolic sizes
-        # if isinstance(dim_sizes[0], (Operation, OpView, Value)):
-        #     dim_sizes = [] if dim_sizes is None else _get_op_results_or_values(dim_sizes)
 
-        res_type = MemRefType.get(dim_sizes, el_type)
-        super().__init__(res_type, [], [], loc=loc, ip=ip)
+# (cls, dim_sizes, el_type) -> memref type; only the type is cached since Annot is
+# mutable and each MemRefValue[...] hands out its own
+_MEMREF_TYPE_CACHE: dict[tuple[type, tuple[int, ...], Type], Type] = {}
 
 
 class MemRefValue(MemRefValue):
+    # no __slots__: the adaptor-generated base (mlir_value_subclass) is created with a
+    # plain type(...) call so instances already carry a __dict__ that slots can't remove
+    # strong ref on purpose: the IR owns the op but not this python OpView, so a weakref
+    # would be dead on arrival (and the OpView doesn't point back here, i.e., no cycle)
     most_recent_store: StoreOp = None
+    # known when we built the memref ourselves; saves a MemRefType round-trip on loads
+    _element_type: Type = None
     alloca_op = AllocaOp
     alloc_op = AllocOp
     load_op = LoadOp
@@ -111,11 +112,15 @@ class MemRefValue(MemRefValue):
 
     @classmethod
     def alloca(cls, dim_sizes: Union[list[int], tuple[int, ...]], el_type: Type):
-        return cls(cls.alloca_op(dim_sizes, el_type).memref)
+        memref_ = cls(cls.alloca_op(dim_sizes, el_type).memref)
+        memref_._element_type = el_type
+        return memref_
 
     @classmethod
     def alloc(cls, dim_sizes: Union[list[int], tuple[int, ...]], el_type: Type):
-        return cls(cls.alloc_op(dim_sizes, el_type).memref)
+        memref_ = cls(cls.alloc_op(dim_sizes, el_type).memref)
+        memref_._element_type = el_type
+        return memref_
 
     def __class_getitem__(
         cls, dim_sizes_el_type: Tuple[Union[list[int], tuple[int, ...]], Type]
@@ -128,20 +133,24 @@ class MemRefValue(MemRefValue):
             isinstance(t, int) for t in dim_sizes[:-1]
         ), f"wrong type T args for tensor: {dim_sizes}"
         assert isinstance(el_type, Type), f"wrong type T args for tensor: {el_type}"
-        dim_sizes = list(dim_sizes)
-        for i, v in enumerate(dim_sizes):
-            if v == -1:
-                dim_sizes[i] = ShapedType.get_dynamic_size()
-        return Annot(cls, cls.memref_type.get(dim_sizes, el_type))
+
+        # keyed on the Type itself (not its id) since it keeps its context alive
+        key = cls, tuple(dim_sizes), el_type
+        memref_type = _MEMREF_TYPE_CACHE.get(key)
+        if memref_type is None:
+            dim_sizes = list(dim_sizes)
+            for i, v in enumerate(dim_sizes):
+                if v == -1:
+                    dim_sizes[i] = ShapedType.get_dynamic_size()
+            memref_type = _MEMREF_TYPE_CACHE[key] = cls.memref_type.get(
+                dim_sizes, el_type
+            )
+        return Annot(cls, memref_type)
 
     def __map_tuple_ints_to_indices(self, tup):
-        if not isinstance(tup, tuple):
-            tup = tuple([tup])
-        tup = list(tup)
-        for i, l in enumerate(tup):
-            if isinstance(l, int):
-                tup[i] = constant(l, index=True)
-        return tuple(tup)
+        if type(tup) is not tuple:
+            tup = (tup,)
+        return [constant(l, index=True) if isinstance(l, int) else l for l in tup]
 
     def __getitem__(self, item):
         item = self.__map_tuple_ints_to_indices(item)
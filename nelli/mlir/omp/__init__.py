@@ -1,3 +1,5 @@
+import weakref
+
 from . import _omp_ops_gen
 from .._mlir import ir
 
@@ -6,8 +8,15 @@ from .._mlir._mlir_libs._site_initialize_0 import (
     register_openmp_dialect_translation,
 )
 
+# contexts themselves rather than their ids so that a recycled id can't skip
+# registration; weak so that registering doesn't keep a context alive
+_registered_contexts: "weakref.WeakSet[ir.Context]" = weakref.WeakSet()
+
 
 def register_dialect_translation(ctx):
+    if ctx in _registered_contexts:
+        return
     registry = ir.DialectRegistry()
     register_openmp_dialect_translation(registry)
     ctx.append_dialect_registry(registry)
+    _registered_contexts.add(ctx)
@@ -1265,6 +1265,10 @@ class Pipeline:
         self._add_pass("reconcile-unrealized-casts")
         return self
 
+    def refbackend_convert_forall_to_for(self):
+        self._add_pass("refbackend-convert-forall-to-for")
+        return self
+
     def refbackend_generalize_tensor_pad(self):
         self._add_pass("refbackend-generalize-tensor-pad")
         return self
@@ -25,7 +25,17 @@ from ..mlir._mlir.runtime import (
     get_ranked_memref_descriptor,
     get_unranked_memref_descriptor,
 )
-from ..mlir._mlir.ir import Module, UnitAttr
+from ..mlir._mlir.dialects import memref, tensor
+from ..mlir._mlir.ir import (
+    FunctionType,
+    InsertionPoint,
+    MemRefType,
+    Module,
+    RankedTensorType,
+    ShapedType,
+    TypeAttr,
+    UnitAttr,
+)
 
 from .utils import run_pipeline
 
@@ -94,6 +104,69 @@ def get_ctype_func(func_name):
     return ctypes.CFUNCTYPE(*ctypes_arg), ret_types
 
 
+def find_kernel_func(module, kernel_name):
+    def cb(op):
+        try:
+            return kernel_name == op.opview.sym_name.value
+        except:
+            return False
+
+    kernel_func = find_ops(module, cb)
+    assert len(kernel_func) == 1, f"kernel func {kernel_func} not found"
+    return kernel_func[0]
+
+
+def specialize_arg_shapes(func, arg_shapes: dict[int, tuple[int, ...]]):
+    """Gives the tensor/memref args of `func` at the positions in `arg_shapes` static
+    shapes; uses inside the body see a cast back to the original (dynamic) type, which
+    canonicalization then folds away."""
+    entry_block = func.regions[0].blocks[0]
+    func_type = FunctionType(TypeAttr(func.attributes["function_type"]).value)
+    inputs = list(func_type.inputs)
+    for i, shape in arg_shapes.items():
+        arg = entry_block.arguments[i]
+        dynamic_type = arg.type
+        if not (
+            RankedTensorType.isinstance(dynamic_type)
+            or MemRefType.isinstance(dynamic_type)
+        ):
+            raise ValueError(f"can't specialize the shape of {dynamic_type}")
+        shaped_type = ShapedType(dynamic_type)
+        if len(shape) != shaped_type.rank:
+            raise ValueError(f"{shape=} doesn't match the rank of {dynamic_type}")
+        for d, size in enumerate(shape):
+            if not (
+                shaped_type.is_dynamic_dim(d) or shaped_type.get_dim_size(d) == size
+            ):
+                raise ValueError(f"{shape=} doesn't match {dynamic_type} at dim {d}")
+
+        if RankedTensorType.isinstance(dynamic_type):
+            element_type = RankedTensorType(dynamic_type).element_type
+            static_type = RankedTensorType.get(shape, element_type)
+            cast_op = tensor.CastOp
+        else:
+            memref_type = MemRefType(dynamic_type)
+            static_type = MemRefType.get(
+                shape,
+                memref_type.element_type,
+                layout=memref_type.layout,
+                memory_space=memref_type.memory_space,
+            )
+            cast_op = memref.CastOp
+
+        arg.set_type(static_type)
+        with InsertionPoint.at_block_begin(entry_block):
+            cast = cast_op(dynamic_type, arg)
+        arg.replace_all_uses_with(cast.result)
+        # including the cast's own use of arg
+        cast.operation.operands[0] = arg
+        inputs[i] = static_type
+
+    func.attributes["function_type"] = TypeAttr.get(
+        FunctionType.get(inputs, func_type.results)
+    )
+
+
 # https://stackoverflow.com/a/68198336/9045206
 CData = ctypes._SimpleCData.__mro__[-2]
 
@@ -157,12 +230,6 @@ class LLVMJITBackend:
         kernel_name="main",
         enable_ir_printing=False,
     ):
-        def cb(op):
-            try:
-                return kernel_name == op.opview.sym_name.value
-            except:
-                return False
-
         needs_cface = False
         if isinstance(pipeline, Pipeline):
             if pipeline.lower_to_llvm_():
@@ -173,9 +240,8 @@ class LLVMJITBackend:
             pipeline_str = pipeline
 
         if needs_cface:
-            kernel_func = find_ops(module, cb)
-            assert len(kernel_func) == 1, f"kernel func {kernel_func} not found"
-            kernel_func[0].attributes["llvm.emit_c_interface"] = UnitAttr.get()
+            kernel_func = find_kernel_func(module, kernel_name)
+            kernel_func.attributes["llvm.emit_c_interface"] = UnitAttr.get()
 
         return run_pipeline(
             module,
@@ -184,6 +250,25 @@ class LLVMJITBackend:
             enable_ir_printing=enable_ir_printing,
         )
 
+    def compile_specialized(
+        self,
+        module: Module,
+        arg_shapes: dict[int, tuple[int, ...]],
+        pipeline: Union[Pipeline, str],
+        kernel_name="main",
+        enable_ir_printing=False,
+    ):
+        """Like `compile` but first pins the dynamic dims of `kernel_name`'s args
+        (keyed on arg position) to concrete sizes, so that the lowering sees static
+        shapes."""
+        specialize_arg_shapes(find_kernel_func(module, kernel_name), arg_shapes)
+        run_pipeline(
+            module,
+            pipeline=Pipeline().canonicalize().cse().materialize(),
+            description="Specializing arg shapes",
+        )
+        return self.compile(module, pipeline, kernel_name, enable_ir_printing)
+
     def load(
         self, module, consume_return_func=None, opt_level=2
     ) -> LLVMJITBackendInvoker:
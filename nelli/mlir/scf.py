@@ -2,7 +2,7 @@ from typing import Optional, Union, Sequence
 
 from ._mlir.dialects._ods_common import get_op_results_or_values
 from .arith import ArithValue, constant
-from .utils import doublewrap, get_dense_int64_array_attr
+from .utils import get_dense_int64_array_attr, paramized_wrap
 from ._mlir.dialects import scf
 from ._mlir.ir import InsertionPoint, IndexType, Operation, OpView, Value
 
@@ -248,7 +248,7 @@ class InParallelOp(scf.InParallelOp):
         return self.regions[0].blocks[0]
 
 
-@doublewrap
+@paramized_wrap
 def forall(f, lower_bounds, upper_bounds=None, steps=None, shared_outs=None):
     if upper_bounds is None:
         upper_bounds = lower_bounds
@@ -8,8 +8,10 @@ from .transform import (
     match_name,
     map_nested_foreach_to_threads,
     unroll,
+    peel,
     get_parent_for_loop,
     pack_greedily,
     lower_pack,
     lower_unpack,
+    pad_linalg_op,
 )
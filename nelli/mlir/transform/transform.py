@@ -25,6 +25,8 @@ from .._mlir.dialects.transform import (
 
 from . import common as common_ext, vector as vector_ext
 from .._mlir.ir import (
+    Attribute,
+    FloatAttr,
     Type,
     Operation,
     Value,
@@ -90,6 +92,14 @@ def unroll(target, factor):
     loop_ext.LoopUnrollOp(target, factor=factor)
 
 
+def peel(target, fail_if_already_divisible=False):
+    return loop_ext.LoopPeelOp(
+        transform_dialect.OperationType.get("scf.for"),
+        target,
+        fail_if_already_divisible=fail_if_already_divisible,
+    ).result
+
+
 def tile_to_scf_for(target, tile_sizes: list[int]):
     return tuple(
         structured_ext.TileToScfForOp(
@@ -110,7 +120,19 @@ def tile_linalg_to_scf_for(target, sizes: list[int]):
     )
 
 
-def tile_to_scf_forall(target, tile_sizes: list[int], mapping=None):
+def tile_to_scf_forall(
+    target,
+    tile_sizes: Optional[list[int]] = None,
+    mapping=None,
+    num_threads: Optional[list[int]] = None,
+):
+    assert (tile_sizes is None) != (
+        num_threads is None
+    ), "exactly one of tile_sizes and num_threads must be given"
+    if tile_sizes is not None:
+        static_sizes = {"static_tile_sizes": get_dense_int64_array_attr(tile_sizes)}
+    else:
+        static_sizes = {"static_num_threads": get_dense_int64_array_attr(num_threads)}
     return tuple(
         structured_ext.TileToForallOp(
             target.type,
@@ -118,8 +140,8 @@ def tile_to_scf_forall(target, tile_sizes: list[int], mapping=None):
             target,
             num_threads=[],
             tile_sizes=[],
-            static_tile_sizes=get_dense_int64_array_attr(tile_sizes),
             mapping=mapping,
+            **static_sizes,
         ).results
     )
 
@@ -278,6 +300,29 @@ def vectorize(
     ).result
 
 
+def pad_linalg_op(
+    target,
+    padding_values: list[Union[float, Attribute]],
+    padding_dimensions: list[int],
+    pack_paddings: Optional[list[int]] = None,
+):
+    # bare floats are taken to be f32 paddings
+    padding_values = [
+        (
+            FloatAttr.get_f32(v)
+            if isinstance(v, (int, float)) and not isinstance(v, bool)
+            else v
+        )
+        for v in padding_values
+    ]
+    return structured_ext.PadOp(
+        target,
+        padding_values=padding_values,
+        padding_dimensions=padding_dimensions,
+        pack_paddings=pack_paddings,
+    ).result
+
+
 def hoist_redundant_tensor_subsets(target):
     pdl_operation_type = pdl.OperationType.get()
     structured_ext.HoistRedundantTensorSubsetsOp(pdl_operation_type, target)
@@ -1,11 +1,10 @@
 import contextlib
 import ctypes
 import os
-import sys
-import tempfile
+import weakref
 from contextlib import ExitStack
 from functools import wraps
-from io import StringIO
+from textwrap import dedent
 from types import FunctionType
 from typing import Optional, Sequence
 
@@ -16,8 +15,15 @@ from ._mlir._mlir_libs._mlir.ir import (
     ArrayAttr,
 )
 from ._mlir.dialects._structured_transform_ops_ext import _get_int64_attr
+from ._mlir.dialects._ods_common import (
+    get_op_result_or_value,
+    get_op_results_or_values,
+)
 from ._mlir.ir import (
+    OpView,
+    Operation,
     StringAttr,
+    Value,
     register_attribute_builder,
     DenseI64ArrayAttr,
     Context,
@@ -25,6 +31,18 @@ from ._mlir.ir import (
 from ._mlir.passmanager import PassManager
 
 
+def as_value(x) -> Value:
+    # fast path for the common case (ArithValue, MemRefValue, ...) before the generic
+    # Operation/OpView/Value dispatch
+    return x if isinstance(x, Value) else get_op_result_or_value(x)
+
+
+def as_values(xs) -> list[Value]:
+    if isinstance(xs, (Operation, OpView)):
+        return get_op_results_or_values(xs)
+    return [as_value(x) for x in xs]
+
+
 class NelliMlirCompilerError(Exception):
     def __init__(self, value: str):
         super().__init__()
@@ -40,6 +58,24 @@ def get_module_name_for_debug_dump(module):
     return StringAttr(module.operation.attributes["nelli.debug_module_name"]).value
 
 
+# context -> {pipeline: PassManager}; keyed on the context itself (rather than its id)
+# so that a cached pm can't outlive the context it was parsed in, and weakly so that
+# the cache doesn't keep dead contexts (and all their pass managers) alive
+_PM_CACHE: "weakref.WeakKeyDictionary[Context, dict[str, PassManager]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_pass_manager(context, pipeline: str) -> PassManager:
+    pms = _PM_CACHE.get(context)
+    if pms is None:
+        pms = _PM_CACHE[context] = {}
+    pm = pms.get(pipeline)
+    if pm is None:
+        pm = pms[pipeline] = PassManager.parse(pipeline)
+    return pm
+
+
 def run_pipeline(
     module,
     pipeline: str,
@@ -47,19 +83,31 @@ def run_pipeline(
     enable_ir_printing=False,
     print_pipeline=False,
 ):
-    """Runs `pipeline` on `module`, with a nice repro report if it fails."""
+    """Runs `pipeline` on `module`, with a nice repro report if it fails.
+
+    By default the IR in the report is dumped after the failure, i.e., possibly
+    partially lowered. Set `NELLI_CAPTURE_PRE_IR=1` to capture the IR before the
+    pipeline runs (at the cost of printing the whole module up front); only then
+    does the report include an `mlir-opt` command that reproduces the failure.
+    """
     module_name = get_module_name_for_debug_dump(module)
+    asm_for_error_report = None
     try:
-        original_stderr = sys.stderr
-        sys.stderr = StringIO()
         # Lower module in place to make it ready for compiler backends.
         with ExitStack() as stack:
             stack.enter_context(module.context)
-            asm_for_error_report = module.operation.get_asm(
-                large_elements_limit=10,
-                enable_debug_info=True,
-            )
-            pm = PassManager.parse(pipeline)
+            # printing the whole module up front is expensive; by default the repro is
+            # printed after the failure (i.e., possibly partially lowered)
+            if os.environ.get("NELLI_CAPTURE_PRE_IR") == "1":
+                asm_for_error_report = module.operation.get_asm(
+                    large_elements_limit=10,
+                    enable_debug_info=True,
+                )
+            if enable_ir_printing:
+                # enable_ir_printing mutates the pm so don't share it
+                pm = PassManager.parse(pipeline)
+            else:
+                pm = _get_pass_manager(module.context, pipeline)
             if print_pipeline:
                 print(pm)
             if enable_ir_printing:
@@ -68,7 +116,14 @@ def run_pipeline(
 
             pm.run(module.operation)
     except Exception as e:
-        print(e, file=sys.stderr)
+        import tempfile
+
+        captured_pre_ir = asm_for_error_report is not None
+        if not captured_pre_ir:
+            asm_for_error_report = module.operation.get_asm(
+                large_elements_limit=10,
+                enable_debug_info=True,
+            )
         filename = os.path.join(tempfile.gettempdir(), module_name + ".mlir")
         with open(filename, "w") as f:
             f.write(asm_for_error_report)
@@ -76,20 +131,38 @@ def run_pipeline(
         # Put something descriptive here even if description is empty.
         description = description or f"{module_name} compile"
 
-        message = f"""\
-            {description} failed with the following diagnostics:
-            
-            {'*' * 80}
-            {sys.stderr.getvalue().strip()}
-            {'*' * 80}
-
+        if captured_pre_ir:
+            repro = """\
             For developers, the error can be reproduced with:
             $ mlir-opt {debug_options} -pass-pipeline='{pipeline}' {filename}
             """
-        trimmed_message = "\n".join([m.lstrip() for m in message.split("\n")])
+        else:
+            # the passes that already succeeded would run again on this IR
+            repro = """\
+            For developers, the IR after the failure (possibly partially lowered) was
+            written to {filename}.
+            Rerun with NELLI_CAPTURE_PRE_IR=1 to capture the input IR and get a
+            command that reproduces the error.
+            """
+
+        # dedent the template before substituting since the diagnostics are multiline
+        header = """\
+            {description} failed with the following diagnostics:
+
+            {stars}
+            {diagnostics}
+            {stars}
+
+            """
+        trimmed_message = (dedent(header) + dedent(repro)).format(
+            description=description,
+            stars="*" * 80,
+            diagnostics=str(e).strip(),
+            debug_options=debug_options,
+            pipeline=pipeline,
+            filename=filename,
+        )
         raise NelliMlirCompilerError(trimmed_message) from None
-    finally:
-        sys.stderr = original_stderr
 
     return module
 
@@ -114,6 +187,21 @@ def doublewrap(f):
     return new_dec
 
 
+def paramized_wrap(f):
+    """
+    a decorator decorator for decorators that are always used with arguments:
+    @decorator(with, arguments, and=kwargs)
+    i.e., doublewrap without the per-application callable check
+    (decorators only ever used bare don't need wrapping at all)
+    """
+
+    @wraps(f)
+    def new_dec(*args, **kwargs):
+        return lambda realf: f(realf, *args, **kwargs)
+
+    return new_dec
+
+
 def extract_wrapped(decorated):
     closure = (c.cell_contents for c in decorated.__closure__)
     return next((c for c in closure if isinstance(c, FunctionType)), None)
@@ -208,6 +296,7 @@ F32 = ir.F32Type.get()
 F64 = ir.F64Type.get()
 I64 = ir.IntegerType.get_signless(64)
 I32 = ir.IntegerType.get_signless(32)
+I8 = ir.IntegerType.get_signless(8)
 Index = ir.IndexType.get()
 
 
@@ -1,4 +1,3 @@
-import builtins
 import contextlib
 import platform
 from typing import Callable, Optional
@@ -16,6 +15,8 @@ from .mlir._mlir._mlir_libs._nelli_mlir import (
     show_sanity_check_access_relation,
     walk_operation,
 )
+from .mlir.affine.affine import _IDENTITY_MAP_ATTR_CACHE
+from .mlir.memref import _MEMREF_TYPE_CACHE
 from .mlir._mlir.ir import (
     Value,
     Module,
@@ -30,14 +31,16 @@ seen_ambiguous_names = {}
 
 def make_disambig_name(o: Value):
     name = show_value_as_operand(o)
-    if name in seen_ambiguous_names and o not in seen_ambiguous_names[name]:
-        seen_ambiguous_names[name][o] = name + "'" * len(seen_ambiguous_names[name])
-    elif name in seen_ambiguous_names and o in seen_ambiguous_names[name]:
-        # name = seen[name][o]
-        pass
-    else:
+    # keyed on the Value itself rather than id(o): python wrappers aren't unique per
+    # SSA value (every op.result returns a fresh one) but hash/eq are pointer based
+    bucket = seen_ambiguous_names.get(name)
+    if bucket is None:
         seen_ambiguous_names[name] = {o: name}
-    return seen_ambiguous_names[name][o]
+        return name
+    disambig_name = bucket.get(o)
+    if disambig_name is None:
+        disambig_name = bucket[o] = name + "'" * len(bucket)
+    return disambig_name
 
 
 def symp_sym(name):
@@ -52,23 +55,38 @@ def reset_disambig_names():
     global seen_ambiguous_names
     seen_ambiguous_names = {}
     _reset_disambig_names()
-
-
-def find_ops(op, pred: Callable[[Operation], bool]):
+    # the cached attrs/types keep their contexts alive; drop them along with the
+    # names (this is also what mlir_gc goes through)
+    _IDENTITY_MAP_ATTR_CACHE.clear()
+    _MEMREF_TYPE_CACHE.clear()
+
+
+def find_ops(
+    op,
+    pred: Optional[Callable[[Operation], bool]] = None,
+    op_name: Optional[str] = None,
+):
+    """Collects ops under `op` satisfying `pred`; `op_name` prefilters in the C++ walk."""
     matching = []
 
-    def find(op):
-        if pred(op):
-            matching.append(op)
+    if pred is None:
+        find = matching.append
+    else:
+
+        def find(op):
+            if pred(op):
+                matching.append(op)
 
-    walk_operation(op.operation, find)
+    walk_operation(op.operation, find, op_name or "")
     return matching
 
 
 def mlir_gc():
     import gc
 
-    for i in builtins.range(10):
+    # a full collection already covers all generations; only go again if the
+    # first pass actually broke cycles (which can free more binding objects)
+    if gc.collect():
         gc.collect()
     reset_disambig_names()
 
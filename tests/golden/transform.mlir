@@ -0,0 +1,584 @@
+// ---BEGIN basic_schedule---
+module {
+  transform.sequence  failures(propagate) {
+  ^bb0(%arg0: !transform.op<"scf.for">):
+    transform.loop.unroll %arg0 {factor = 42 : i64} : !transform.op<"scf.for">
+  }
+}
+// ---BEGIN basic_sugar---
+module {
+  transform.sequence  failures(propagate) attributes {transform.target_tag = "basic"} {
+  ^bb0(%arg0: !transform.op<"scf.for">):
+    transform.loop.unroll %arg0 {factor = 42 : i64} : !transform.op<"scf.for">
+  }
+}
+// ---BEGIN basic_unroll---
+module {
+  func.func @loop_unroll_op() {
+    %c0 = arith.constant 0 : index
+    %c42 = arith.constant 42 : index
+    %c5 = arith.constant 5 : index
+    scf.for %arg0 = %c0 to %c42 step %c5 {
+      %0 = arith.addi %arg0, %arg0 : index
+    }
+    return
+  }
+  transform.sequence  failures(propagate) attributes {transform.target_tag = "basic"} {
+  ^bb0(%arg0: !pdl.operation):
+    %0 = transform.structured.match ops{["arith.addi"]} in %arg0 : (!pdl.operation) -> !pdl.operation
+    %1 = transform.loop.get_parent_for %0 : (!pdl.operation) -> !transform.op<"scf.for">
+    transform.loop.unroll %1 {factor = 4 : i64} : !transform.op<"scf.for">
+  }
+}
+// ---BEGIN basic_unroll_transformed---
+module {
+  func.func @loop_unroll_op() {
+    %c0 = arith.constant 0 : index
+    %c42 = arith.constant 42 : index
+    %c5 = arith.constant 5 : index
+    %c40 = arith.constant 40 : index
+    %c20 = arith.constant 20 : index
+    scf.for %arg0 = %c0 to %c40 step %c20 {
+      %1 = arith.addi %arg0, %arg0 : index
+      %c1 = arith.constant 1 : index
+      %2 = arith.muli %c5, %c1 : index
+      %3 = arith.addi %arg0, %2 : index
+      %4 = arith.addi %3, %3 : index
+      %c2 = arith.constant 2 : index
+      %5 = arith.muli %c5, %c2 : index
+      %6 = arith.addi %arg0, %5 : index
+      %7 = arith.addi %6, %6 : index
+      %c3 = arith.constant 3 : index
+      %8 = arith.muli %c5, %c3 : index
+      %9 = arith.addi %arg0, %8 : index
+      %10 = arith.addi %9, %9 : index
+    }
+    %0 = arith.addi %c40, %c40 : index
+    return
+  }
+}
+// ---BEGIN basic_peel---
+module {
+  func.func @loop_peel_op() {
+    %c0 = arith.constant 0 : index
+    %c42 = arith.constant 42 : index
+    %c5 = arith.constant 5 : index
+    scf.for %arg0 = %c0 to %c42 step %c5 {
+      %0 = arith.addi %arg0, %arg0 : index
+    }
+    return
+  }
+  transform.sequence  failures(propagate) attributes {transform.target_tag = "basic"} {
+  ^bb0(%arg0: !pdl.operation):
+    %0 = transform.structured.match ops{["arith.addi"]} in %arg0 : (!pdl.operation) -> !pdl.operation
+    %1 = transform.loop.get_parent_for %0 : (!pdl.operation) -> !transform.op<"scf.for">
+    %2 = transform.loop.peel %1 : (!transform.op<"scf.for">) -> !transform.op<"scf.for">
+  }
+}
+// ---BEGIN basic_peel_transformed---
+module {
+  func.func @loop_peel_op() {
+    %c0 = arith.constant 0 : index
+    %c42 = arith.constant 42 : index
+    %c5 = arith.constant 5 : index
+    %c40 = arith.constant 40 : index
+    scf.for %arg0 = %c0 to %c40 step %c5 {
+      %0 = arith.addi %arg0, %arg0 : index
+    }
+    scf.for %arg0 = %c40 to %c42 step %c5 {
+      %0 = arith.addi %arg0, %arg0 : index
+    }
+    return
+  }
+}
+// ---BEGIN basic_tile---
+module {
+  func.func @pad_tensor_3_4(%arg0: tensor<4x16xf32>, %arg1: f32) -> tensor<12x23xf32> {
+    %padded = tensor.pad %arg0 low[3, 4] high[5, 3] {
+    ^bb0(%arg2: index, %arg3: index):
+      tensor.yield %arg1 : f32
+    } : tensor<4x16xf32> to tensor<12x23xf32>
+    return %padded : tensor<12x23xf32>
+  }
+  transform.sequence  failures(propagate) attributes {transform.target_tag = "basic"} {
+  ^bb0(%arg0: !pdl.operation):
+    %0 = transform.structured.match ops{["tensor.pad"]} in %arg0 : (!pdl.operation) -> !pdl.operation
+    %tiled_linalg_op, %loops:2 = transform.structured.tile_to_scf_for %0[2, 3]
+  }
+}
+// ---BEGIN basic_tile_transformed---
+#map = affine_map<(d0) -> (-d0 + 23, 3)>
+#map1 = affine_map<(d0) -> (-d0 + 3, 0)>
+#map2 = affine_map<(d0) -> (0, d0 - 3)>
+#map3 = affine_map<(d0) -> (4, d0)>
+#map4 = affine_map<(d0) -> (0, d0 - 1)>
+#map5 = affine_map<(d0, d1) -> (d0 - d1)>
+#map6 = affine_map<(d0, d1, d2) -> (-d0 - d1 + d2 + 2)>
+#map7 = affine_map<(d0) -> (-d0 + 4, 0)>
+#map8 = affine_map<(d0) -> (0, d0 - 4)>
+#map9 = affine_map<(d0) -> (16, d0)>
+#map10 = affine_map<(d0, d1) -> (0, d0 + d1 - 4)>
+#map11 = affine_map<(d0, d1, d2, d3) -> (-d0 + d1 - d2 + d3)>
+module {
+  func.func @pad_tensor_3_4(%arg0: tensor<4x16xf32>, %arg1: f32) -> tensor<12x23xf32> {
+    %c23 = arith.constant 23 : index
+    %c12 = arith.constant 12 : index
+    %c3 = arith.constant 3 : index
+    %c2 = arith.constant 2 : index
+    %c0 = arith.constant 0 : index
+    %0 = tensor.empty() : tensor<12x23xf32>
+    %1 = scf.for %arg2 = %c0 to %c12 step %c2 iter_args(%arg3 = %0) -> (tensor<12x23xf32>) {
+      %2 = scf.for %arg4 = %c0 to %c23 step %c3 iter_args(%arg5 = %arg3) -> (tensor<12x23xf32>) {
+        %3 = affine.min #map(%arg4)
+        %4 = affine.max #map1(%arg2)
+        %5 = affine.max #map2(%arg2)
+        %6 = affine.min #map3(%5)
+        %7 = affine.max #map4(%arg2)
+        %8 = affine.min #map3(%7)
+        %9 = affine.apply #map5(%8, %6)
+        %10 = arith.cmpi eq, %9, %c0 : index
+        %11 = affine.apply #map6(%4, %8, %6)
+        %12 = affine.max #map7(%arg4)
+        %13 = affine.max #map8(%arg4)
+        %14 = affine.min #map9(%13)
+        %15 = affine.max #map10(%3, %arg4)
+        %16 = affine.min #map9(%15)
+        %17 = affine.apply #map5(%16, %14)
+        %18 = arith.cmpi eq, %17, %c0 : index
+        %19 = arith.ori %18, %10 : i1
+        %20 = affine.apply #map11(%12, %3, %16, %14)
+        %21 = scf.if %19 -> (tensor<?x?xf32>) {
+          %generated = tensor.generate %3 {
+          ^bb0(%arg6: index, %arg7: index):
+            tensor.yield %arg1 : f32
+          } : tensor<2x?xf32>
+          %cast_0 = tensor.cast %generated : tensor<2x?xf32> to tensor<?x?xf32>
+          scf.yield %cast_0 : tensor<?x?xf32>
+        } else {
+          %extracted_slice = tensor.extract_slice %arg0[%6, %14] [%9, %17] [1, 1] : tensor<4x16xf32> to tensor<?x?xf32>
+          %padded = tensor.pad %extracted_slice low[%4, %12] high[%11, %20] {
+          ^bb0(%arg6: index, %arg7: index):
+            tensor.yield %arg1 : f32
+          } : tensor<?x?xf32> to tensor<?x?xf32>
+          scf.yield %padded : tensor<?x?xf32>
+        }
+        %cast = tensor.cast %21 : tensor<?x?xf32> to tensor<2x?xf32>
+        %inserted_slice = tensor.insert_slice %cast into %arg5[%arg2, %arg4] [2, %3] [1, 1] : tensor<2x?xf32> into tensor<12x23xf32>
+        scf.yield %inserted_slice : tensor<12x23xf32>
+      }
+      scf.yield %2 : tensor<12x23xf32>
+    }
+    return %1 : tensor<12x23xf32>
+  }
+}
+// ---BEGIN linalg_tile---
+module {
+  func.func @matmul(%arg0: tensor<4x16xf32>, %arg1: tensor<16x8xf32>, %arg2: tensor<4x8xf32>) -> tensor<4x8xf32> {
+    %0 = linalg.matmul {cast = #linalg.type_fn<cast_signed>} ins(%arg0, %arg1 : tensor<4x16xf32>, tensor<16x8xf32>) outs(%arg2 : tensor<4x8xf32>) -> tensor<4x8xf32>
+    return %0 : tensor<4x8xf32>
+  }
+  transform.sequence  failures(propagate) attributes {transform.target_tag = "basic"} {
+  ^bb0(%arg0: !pdl.operation):
+    %0 = transform.structured.match ops{["linalg.matmul"]} in %arg0 : (!pdl.operation) -> !pdl.operation
+    %tiled_linalg_op, %loops:2 = transform.structured.tile %0[2, 3] : (!pdl.operation) -> (!pdl.operation, !transform.op<"scf.for">, !transform.op<"scf.for">)
+  }
+}
+// ---BEGIN linalg_tile_transformed---
+#map = affine_map<(d0) -> (3, -d0 + 8)>
+#map1 = affine_map<(d0) -> (d0 - 1)>
+module {
+  func.func @matmul(%arg0: tensor<4x16xf32>, %arg1: tensor<16x8xf32>, %arg2: tensor<4x8xf32>) -> tensor<4x8xf32> {
+    %c2 = arith.constant 2 : index
+    %c3 = arith.constant 3 : index
+    %c0 = arith.constant 0 : index
+    %c0_0 = arith.constant 0 : index
+    %c4 = arith.constant 4 : index
+    %0 = scf.for %arg3 = %c0_0 to %c4 step %c2 iter_args(%arg4 = %arg2) -> (tensor<4x8xf32>) {
+      %c0_1 = arith.constant 0 : index
+      %c8 = arith.constant 8 : index
+      %1 = scf.for %arg5 = %c0_1 to %c8 step %c3 iter_args(%arg6 = %arg4) -> (tensor<4x8xf32>) {
+        %c8_2 = arith.constant 8 : index
+        %2 = affine.min #map(%arg5)
+        %c0_3 = arith.constant 0 : index
+        %c16 = arith.constant 16 : index
+        %3 = affine.apply #map1(%2)
+        %4 = affine.apply #map1(%2)
+        %5 = affine.apply #map1(%2)
+        %extracted_slice = tensor.extract_slice %arg0[%arg3, 0] [2, 16] [1, 1] : tensor<4x16xf32> to tensor<2x16xf32>
+        %extracted_slice_4 = tensor.extract_slice %arg1[0, %arg5] [16, %2] [1, 1] : tensor<16x8xf32> to tensor<16x?xf32>
+        %extracted_slice_5 = tensor.extract_slice %arg6[%arg3, %arg5] [2, %2] [1, 1] : tensor<4x8xf32> to tensor<2x?xf32>
+        %6 = linalg.matmul {cast = #linalg.type_fn<cast_signed>} ins(%extracted_slice, %extracted_slice_4 : tensor<2x16xf32>, tensor<16x?xf32>) outs(%extracted_slice_5 : tensor<2x?xf32>) -> tensor<2x?xf32>
+        %7 = affine.apply #map1(%2)
+        %8 = affine.apply #map1(%2)
+        %inserted_slice = tensor.insert_slice %6 into %arg6[%arg3, %arg5] [2, %2] [1, 1] : tensor<2x?xf32> into tensor<4x8xf32>
+        scf.yield %inserted_slice : tensor<4x8xf32>
+      }
+      scf.yield %1 : tensor<4x8xf32>
+    }
+    return %0 : tensor<4x8xf32>
+  }
+}
+// ---BEGIN linalg_pad---
+module {
+  func.func @matmul(%arg0: tensor<4x16xf32>, %arg1: tensor<16x8xf32>, %arg2: tensor<4x8xf32>) -> tensor<4x8xf32> {
+    %0 = linalg.matmul {cast = #linalg.type_fn<cast_signed>} ins(%arg0, %arg1 : tensor<4x16xf32>, tensor<16x8xf32>) outs(%arg2 : tensor<4x8xf32>) -> tensor<4x8xf32>
+    return %0 : tensor<4x8xf32>
+  }
+  transform.sequence  failures(propagate) attributes {transform.target_tag = "basic"} {
+  ^bb0(%arg0: !pdl.operation):
+    %0 = transform.structured.match ops{["linalg.matmul"]} in %arg0 : (!pdl.operation) -> !pdl.operation
+    %tiled_linalg_op, %loops:2 = transform.structured.tile %0[2, 3] : (!pdl.operation) -> (!pdl.operation, !transform.op<"scf.for">, !transform.op<"scf.for">)
+    %1 = transform.structured.match ops{["linalg.matmul"]} in %arg0 : (!pdl.operation) -> !pdl.operation
+    %2 = transform.structured.pad %1 {pack_paddings = [1, 1, 0], padding_dimensions = [0, 1, 2], padding_values = [0.000000e+00 : f32, 0.000000e+00 : f32, 0.000000e+00 : f32]}
+  }
+}
+// ---BEGIN linalg_pad_transformed---
+#map = affine_map<(d0) -> (3, -d0 + 8)>
+#map1 = affine_map<(d0) -> (d0 - 1)>
+#map2 = affine_map<() -> (0)>
+#map3 = affine_map<(d0) -> (-d0 + 3)>
+module {
+  func.func @matmul(%arg0: tensor<4x16xf32>, %arg1: tensor<16x8xf32>, %arg2: tensor<4x8xf32>) -> tensor<4x8xf32> {
+    %c2 = arith.constant 2 : index
+    %c3 = arith.constant 3 : index
+    %c0 = arith.constant 0 : index
+    %c0_0 = arith.constant 0 : index
+    %c4 = arith.constant 4 : index
+    %0 = scf.for %arg3 = %c0_0 to %c4 step %c2 iter_args(%arg4 = %arg2) -> (tensor<4x8xf32>) {
+      %c0_1 = arith.constant 0 : index
+      %c8 = arith.constant 8 : index
+      %1 = scf.for %arg5 = %c0_1 to %c8 step %c3 iter_args(%arg6 = %arg4) -> (tensor<4x8xf32>) {
+        %c8_2 = arith.constant 8 : index
+        %2 = affine.min #map(%arg5)
+        %c0_3 = arith.constant 0 : index
+        %c16 = arith.constant 16 : index
+        %3 = affine.apply #map1(%2)
+        %4 = affine.apply #map1(%2)
+        %5 = affine.apply #map1(%2)
+        %extracted_slice = tensor.extract_slice %arg0[%arg3, 0] [2, 16] [1, 1] : tensor<4x16xf32> to tensor<2x16xf32>
+        %extracted_slice_4 = tensor.extract_slice %arg1[0, %arg5] [16, %2] [1, 1] : tensor<16x8xf32> to tensor<16x?xf32>
+        %extracted_slice_5 = tensor.extract_slice %arg6[%arg3, %arg5] [2, %2] [1, 1] : tensor<4x8xf32> to tensor<2x?xf32>
+        %cst = arith.constant 0.000000e+00 : f32
+        %c0_6 = arith.constant 0 : index
+        %c0_7 = arith.constant 0 : index
+        %c2_8 = arith.constant 2 : index
+        %6 = affine.apply #map2()
+        %c1 = arith.constant 1 : index
+        %c16_9 = arith.constant 16 : index
+        %7 = affine.apply #map2()
+        %padded = tensor.pad %extracted_slice nofold low[%c0_6, %c0_6] high[%6, %7] {
+        ^bb0(%arg7: index, %arg8: index):
+          tensor.yield %cst : f32
+        } : tensor<2x16xf32> to tensor<2x16xf32>
+        %cst_10 = arith.constant 0.000000e+00 : f32
+        %c0_11 = arith.constant 0 : index
+        %c0_12 = arith.constant 0 : index
+        %c16_13 = arith.constant 16 : index
+        %8 = affine.apply #map2()
+        %c1_14 = arith.constant 1 : index
+        %9 = affine.apply #map3(%2)
+        %padded_15 = tensor.pad %extracted_slice_4 nofold low[%c0_11, %c0_11] high[%8, %9] {
+        ^bb0(%arg7: index, %arg8: index):
+          tensor.yield %cst_10 : f32
+        } : tensor<16x?xf32> to tensor<16x3xf32>
+        %cst_16 = arith.constant 0.000000e+00 : f32
+        %c0_17 = arith.constant 0 : index
+        %c0_18 = arith.constant 0 : index
+        %c2_19 = arith.constant 2 : index
+        %10 = affine.apply #map2()
+        %c1_20 = arith.constant 1 : index
+        %11 = affine.apply #map3(%2)
+        %padded_21 = tensor.pad %extracted_slice_5 low[%c0_17, %c0_17] high[%10, %11] {
+        ^bb0(%arg7: index, %arg8: index):
+          tensor.yield %cst_16 : f32
+        } : tensor<2x?xf32> to tensor<2x3xf32>
+        %c1_22 = arith.constant 1 : index
+        %c1_23 = arith.constant 1 : index
+        %12 = linalg.matmul {cast = #linalg.type_fn<cast_signed>} ins(%padded, %padded_15 : tensor<2x16xf32>, tensor<16x3xf32>) outs(%padded_21 : tensor<2x3xf32>) -> tensor<2x3xf32>
+        %extracted_slice_24 = tensor.extract_slice %12[0, 0] [2, %2] [1, 1] : tensor<2x3xf32> to tensor<2x?xf32>
+        %13 = affine.apply #map1(%2)
+        %14 = affine.apply #map1(%2)
+        %inserted_slice = tensor.insert_slice %extracted_slice_24 into %arg6[%arg3, %arg5] [2, %2] [1, 1] : tensor<2x?xf32> into tensor<4x8xf32>
+        scf.yield %inserted_slice : tensor<4x8xf32>
+      }
+      scf.yield %1 : tensor<4x8xf32>
+    }
+    return %0 : tensor<4x8xf32>
+  }
+}
+// ---BEGIN simple_matmul_tile_foreach_thread---
+module {
+  func.func @matmul(%arg0: tensor<4x16xf32>, %arg1: tensor<16x8xf32>, %arg2: tensor<4x8xf32>) -> tensor<4x8xf32> {
+    %0 = linalg.matmul {cast = #linalg.type_fn<cast_signed>} ins(%arg0, %arg1 : tensor<4x16xf32>, tensor<16x8xf32>) outs(%arg2 : tensor<4x8xf32>) -> tensor<4x8xf32>
+    return %0 : tensor<4x8xf32>
+  }
+  transform.sequence  failures(propagate) attributes {transform.target_tag = "basic"} {
+  ^bb0(%arg0: !pdl.operation):
+    %0 = transform.structured.match ops{["linalg.matmul"]} in %arg0 : (!pdl.operation) -> !pdl.operation
+    %forall_op, %tiled_op = transform.structured.tile_to_forall_op %0   tile_sizes [2, 3]
+  }
+}
+// ---BEGIN simple_matmul_tile_foreach_thread_transformed---
+#map = affine_map<(d0) -> (d0 * 2)>
+#map1 = affine_map<(d0) -> (d0 * 3)>
+#map2 = affine_map<(d0) -> (d0 * -3 + 8)>
+#map3 = affine_map<(d0) -> (d0 * -3 + 8, 3)>
+#map4 = affine_map<(d0) -> (d0 - 1)>
+module {
+  func.func @matmul(%arg0: tensor<4x16xf32>, %arg1: tensor<16x8xf32>, %arg2: tensor<4x8xf32>) -> tensor<4x8xf32> {
+    %c2 = arith.constant 2 : index
+    %c3 = arith.constant 3 : index
+    %0 = scf.forall (%arg3, %arg4) in (2, 3) shared_outs(%arg5 = %arg2) -> (tensor<4x8xf32>) {
+      %1 = affine.apply #map(%arg3)
+      %2 = affine.apply #map1(%arg4)
+      %3 = affine.apply #map2(%arg4)
+      %4 = affine.min #map3(%arg4)
+      %5 = affine.apply #map4(%4)
+      %6 = affine.apply #map(%arg3)
+      %7 = affine.apply #map1(%arg4)
+      %8 = affine.apply #map4(%4)
+      %9 = affine.apply #map(%arg3)
+      %10 = affine.apply #map1(%arg4)
+      %11 = affine.apply #map4(%4)
+      %extracted_slice = tensor.extract_slice %arg0[%6, 0] [2, 16] [1, 1] : tensor<4x16xf32> to tensor<2x16xf32>
+      %extracted_slice_0 = tensor.extract_slice %arg1[0, %7] [16, %4] [1, 1] : tensor<16x8xf32> to tensor<16x?xf32>
+      %extracted_slice_1 = tensor.extract_slice %arg5[%9, %10] [2, %4] [1, 1] : tensor<4x8xf32> to tensor<2x?xf32>
+      %12 = linalg.matmul {cast = #linalg.type_fn<cast_signed>} ins(%extracted_slice, %extracted_slice_0 : tensor<2x16xf32>, tensor<16x?xf32>) outs(%extracted_slice_1 : tensor<2x?xf32>) -> tensor<2x?xf32>
+      %13 = affine.apply #map4(%4)
+      %14 = affine.apply #map(%arg3)
+      %15 = affine.apply #map1(%arg4)
+      %16 = affine.apply #map4(%4)
+      scf.forall.in_parallel {
+        tensor.parallel_insert_slice %12 into %arg5[%14, %15] [2, %4] [1, 1] : tensor<2x?xf32> into tensor<4x8xf32>
+      }
+    }
+    return %0 : tensor<4x8xf32>
+  }
+}
+// ---BEGIN convert_forall_to_for---
+module {
+  func.func @forall_to_for(%arg0: memref<4x8xf32>) {
+    %cst = arith.constant 1.000000e+00 : f32
+    %c0 = arith.constant 0 : index
+    %c0_0 = arith.constant 0 : index
+    %c4 = arith.constant 4 : index
+    %c8 = arith.constant 8 : index
+    %c1 = arith.constant 1 : index
+    %c1_1 = arith.constant 1 : index
+    scf.for %arg1 = %c0 to %c4 step %c1 {
+      scf.for %arg2 = %c0_0 to %c8 step %c1_1 {
+        memref.store %cst, %arg0[%arg1, %arg2] : memref<4x8xf32>
+      }
+    }
+    return
+  }
+  func.func @nested_forall_to_for(%arg0: memref<4x8xf32>) {
+    %cst = arith.constant 1.000000e+00 : f32
+    %c0 = arith.constant 0 : index
+    %c4 = arith.constant 4 : index
+    %c1 = arith.constant 1 : index
+    scf.for %arg1 = %c0 to %c4 step %c1 {
+      %c0_0 = arith.constant 0 : index
+      %c8 = arith.constant 8 : index
+      %c1_1 = arith.constant 1 : index
+      scf.for %arg2 = %c0_0 to %c8 step %c1_1 {
+        memref.store %cst, %arg0[%arg1, %arg2] : memref<4x8xf32>
+      }
+    }
+    return
+  }
+}
+// ---BEGIN gpu_foreach_thread---
+#map = affine_map<()[s0] -> (s0 ceildiv 10)>
+#map1 = affine_map<(d0)[s0] -> (d0 * (s0 ceildiv 10))>
+#map2 = affine_map<()[s0] -> (-s0 + (s0 ceildiv 10) * 10)>
+#map3 = affine_map<(d0)[s0] -> (-(d0 * (s0 ceildiv 10)) + s0)>
+#map4 = affine_map<(d0)[s0] -> (-(d0 * (s0 ceildiv 10)) + s0, s0 ceildiv 10)>
+#map5 = affine_map<(d0) -> (0, d0)>
+#map6 = affine_map<()[s0] -> (s0 ceildiv 20)>
+#map7 = affine_map<(d0)[s0] -> (d0 * (s0 ceildiv 20))>
+#map8 = affine_map<()[s0] -> (-s0 + (s0 ceildiv 20) * 20)>
+#map9 = affine_map<(d0)[s0] -> (-(d0 * (s0 ceildiv 20)) + s0)>
+#map10 = affine_map<(d0)[s0] -> (-(d0 * (s0 ceildiv 20)) + s0, s0 ceildiv 20)>
+#map11 = affine_map<(d0) -> (d0 - 1)>
+#map12 = affine_map<()[s0] -> (s0 - 1)>
+module {
+  func.func @matmul(%arg0: tensor<?x?xf32>, %arg1: tensor<?x?xf32>, %arg2: tensor<?x?xf32>) -> tensor<?x?xf32> {
+    %c0 = arith.constant 0 : index
+    %dim = tensor.dim %arg0, %c0 : tensor<?x?xf32>
+    %c1 = arith.constant 1 : index
+    %dim_0 = tensor.dim %arg0, %c1 : tensor<?x?xf32>
+    %c0_1 = arith.constant 0 : index
+    %dim_2 = tensor.dim %arg1, %c0_1 : tensor<?x?xf32>
+    %c1_3 = arith.constant 1 : index
+    %dim_4 = tensor.dim %arg1, %c1_3 : tensor<?x?xf32>
+    %c0_5 = arith.constant 0 : index
+    %dim_6 = tensor.dim %arg2, %c0_5 : tensor<?x?xf32>
+    %c1_7 = arith.constant 1 : index
+    %dim_8 = tensor.dim %arg2, %c1_7 : tensor<?x?xf32>
+    %c10 = arith.constant 10 : index
+    %c20 = arith.constant 20 : index
+    %0 = scf.forall (%arg3, %arg4) in (10, 20) shared_outs(%arg5 = %arg2) -> (tensor<?x?xf32>) {
+      %1 = affine.apply #map()[%dim]
+      %2 = affine.apply #map1(%arg3)[%dim]
+      %3 = affine.apply #map2()[%dim]
+      %4 = affine.apply #map3(%arg3)[%dim]
+      %5 = affine.min #map4(%arg3)[%dim]
+      %6 = affine.max #map5(%5)
+      %7 = affine.apply #map6()[%dim_4]
+      %8 = affine.apply #map7(%arg4)[%dim_4]
+      %9 = affine.apply #map8()[%dim_4]
+      %10 = affine.apply #map9(%arg4)[%dim_4]
+      %11 = affine.min #map10(%arg4)[%dim_4]
+      %12 = affine.max #map5(%11)
+      %13 = affine.apply #map11(%6)
+      %14 = affine.apply #map11(%12)
+      %15 = affine.apply #map12()[%dim_0]
+      %16 = affine.apply #map1(%arg3)[%dim]
+      %17 = affine.apply #map11(%6)
+      %18 = affine.apply #map12()[%dim_0]
+      %19 = affine.apply #map12()[%dim_0]
+      %20 = affine.apply #map7(%arg4)[%dim_4]
+      %21 = affine.apply #map11(%12)
+      %22 = affine.apply #map1(%arg3)[%dim]
+      %23 = affine.apply #map11(%6)
+      %24 = affine.apply #map7(%arg4)[%dim_4]
+      %25 = affine.apply #map11(%12)
+      %extracted_slice = tensor.extract_slice %arg0[%16, 0] [%6, %dim_0] [1, 1] : tensor<?x?xf32> to tensor<?x?xf32>
+      %extracted_slice_9 = tensor.extract_slice %arg1[0, %20] [%dim_0, %12] [1, 1] : tensor<?x?xf32> to tensor<?x?xf32>
+      %extracted_slice_10 = tensor.extract_slice %arg5[%22, %24] [%6, %12] [1, 1] : tensor<?x?xf32> to tensor<?x?xf32>
+      %26 = linalg.matmul ins(%extracted_slice, %extracted_slice_9 : tensor<?x?xf32>, tensor<?x?xf32>) outs(%extracted_slice_10 : tensor<?x?xf32>) -> tensor<?x?xf32>
+      %27 = affine.apply #map11(%6)
+      %28 = affine.apply #map11(%12)
+      %29 = affine.apply #map12()[%dim_0]
+      %30 = affine.apply #map1(%arg3)[%dim]
+      %31 = affine.apply #map11(%6)
+      %32 = affine.apply #map7(%arg4)[%dim_4]
+      %33 = affine.apply #map11(%12)
+      scf.forall.in_parallel {
+        tensor.parallel_insert_slice %26 into %arg5[%30, %32] [%6, %12] [1, 1] : tensor<?x?xf32> into tensor<?x?xf32>
+      }
+    } {mapping = [#gpu.thread<y>, #gpu.thread<x>]}
+    return %0 : tensor<?x?xf32>
+  }
+}
+// ---BEGIN contraction_matmul---
+module {
+  func.func @contraction_matmul(%arg0: memref<10x10xf32>, %arg1: memref<10x10xf32>, %arg2: memref<10x10xf32>) {
+    %c0 = arith.constant 0 : index
+    %cst = arith.constant 0.000000e+00 : f32
+    %0 = vector.transfer_read %arg0[%c0, %c0], %cst {in_bounds = [true, true]} : memref<10x10xf32>, vector<10x10xf32>
+    %1 = vector.broadcast %0 : vector<10x10xf32> to vector<10x10x10xf32>
+    %2 = vector.transpose %1, [1, 0, 2] : vector<10x10x10xf32> to vector<10x10x10xf32>
+    %3 = vector.transfer_read %arg1[%c0, %c0], %cst {in_bounds = [true, true]} : memref<10x10xf32>, vector<10x10xf32>
+    %4 = vector.broadcast %3 : vector<10x10xf32> to vector<10x10x10xf32>
+    %5 = vector.transpose %4, [0, 2, 1] : vector<10x10x10xf32> to vector<10x10x10xf32>
+    %6 = vector.transfer_read %arg2[%c0, %c0], %cst {in_bounds = [true, true]} : memref<10x10xf32>, vector<10x10xf32>
+    %7 = arith.mulf %2, %5 : vector<10x10x10xf32>
+    %8 = vector.multi_reduction <add>, %7, %6 [2] : vector<10x10x10xf32> to vector<10x10xf32>
+    vector.transfer_write %8, %arg2[%c0, %c0] {in_bounds = [true, true]} : vector<10x10xf32>, memref<10x10xf32>
+    return
+  }
+}
+// ---BEGIN common_extension_with_pdl_patterns---
+module {
+  func.func @select_cmp_eq_select(%arg0: i64, %arg1: i64) -> i64 {
+    return %arg1 : i64
+  }
+}
+// ---BEGIN common_extension_sequence---
+module {
+  func.func @select_cmp_eq_select(%arg0: i64, %arg1: i64) -> i64 {
+    return %arg1 : i64
+  }
+}
+// ---BEGIN common_extension_sugar---
+module {
+  func.func @select_cmp_eq_select(%arg0: i64, %arg1: i64) -> i64 {
+    %0 = arith.cmpi eq, %arg0, %arg1 : i64
+    %1 = arith.select %0, %arg0, %arg1 : i64
+    return %1 : i64
+  }
+  transform.sequence  failures(propagate) attributes {transform.target_tag = "basic"} {
+  ^bb0(%arg0: !pdl.operation):
+    %0 = transform.structured.match ops{["func.func"]} in %arg0 : (!pdl.operation) -> !pdl.operation
+    apply_patterns %0 {canonicalization} : (!pdl.operation) -> ()
+  }
+}
+// ---BEGIN common_extension_sugar_transformed---
+module {
+  func.func @select_cmp_eq_select(%arg0: i64, %arg1: i64) -> i64 {
+    return %arg1 : i64
+  }
+}
+// ---BEGIN common_ext_2---
+#map = affine_map<(d0) -> (d0 * 4)>
+#map1 = affine_map<(d0, d1) -> (d0, d1)>
+module {
+  func.func @promote() -> tensor<16x128xf32> {
+    %c0 = arith.constant 0 : index
+    %cst = arith.constant 0.000000e+00 : f32
+    %c16 = arith.constant 16 : index
+    %c32 = arith.constant 32 : index
+    %0 = tensor.empty() : tensor<16x128xf32>
+    %1 = linalg.fill ins(%cst : f32) outs(%0 : tensor<16x128xf32>) -> tensor<16x128xf32>
+    %2 = scf.forall (%arg0, %arg1) in (%c16, %c32) shared_outs(%arg2 = %1) -> (tensor<16x128xf32>) {
+      %3 = affine.apply #map(%arg1)
+      %extracted_slice = tensor.extract_slice %arg2[%arg0, %3] [1, 4] [1, 1] : tensor<16x128xf32> to tensor<1x4xf32>
+      %extracted_slice_0 = tensor.extract_slice %arg2[%arg0, %3] [1, 4] [1, 1] : tensor<16x128xf32> to tensor<1x4xf32>
+      %4 = linalg.generic {indexing_maps = [#map1, #map1], iterator_types = ["parallel", "parallel"]} ins(%extracted_slice : tensor<1x4xf32>) outs(%extracted_slice_0 : tensor<1x4xf32>) {
+      ^bb0(%in: f32, %out: f32):
+        %5 = arith.addf %in, %in : f32
+        linalg.yield %5 : f32
+      } -> tensor<1x4xf32>
+      scf.forall.in_parallel {
+        tensor.parallel_insert_slice %4 into %arg2[%arg0, %3] [1, 4] [1, 1] : tensor<1x4xf32> into tensor<16x128xf32>
+      }
+    }
+    return %2 : tensor<16x128xf32>
+  }
+}
+// ---BEGIN common_ext_2_sugar---
+module {
+  func.func @promote() {
+    %cst = arith.constant 0.000000e+00 : f32
+    %0 = tensor.empty() : tensor<16x128xf32>
+    %1 = linalg.fill ins(%cst : f32) outs(%0 : tensor<16x128xf32>) -> tensor<16x128xf32>
+    %2 = scf.forall (%arg0, %arg1) in (16, 32) shared_outs(%arg2 = %1) -> (tensor<16x128xf32>) {
+      %c4 = arith.constant 4 : index
+      %3 = arith.muli %c4, %arg1 : index
+      %extracted_slice = tensor.extract_slice %1[%arg0, %3] [1, 4] [1, 1] : tensor<16x128xf32> to tensor<1x4xf32>
+      %extracted_slice_0 = tensor.extract_slice %arg2[%arg0, %3] [1, 4] [1, 1] : tensor<16x128xf32> to tensor<1x4xf32>
+      %4 = linalg.elemwise_binary {cast = #linalg.type_fn<cast_signed>, fun = #linalg.binary_fn<add>} ins(%extracted_slice, %extracted_slice : tensor<1x4xf32>, tensor<1x4xf32>) outs(%extracted_slice_0 : tensor<1x4xf32>) -> tensor<1x4xf32>
+      scf.forall.in_parallel {
+        tensor.parallel_insert_slice %4 into %arg2[%arg0, %3] [1, 4] [1, 1] : tensor<1x4xf32> into tensor<16x128xf32>
+      }
+    }
+    return
+  }
+  transform.sequence  failures(propagate) attributes {transform.target_tag = "basic"} {
+  ^bb0(%arg0: !pdl.operation):
+    %0 = transform.structured.match ops{["scf.forall"]} in %arg0 : (!pdl.operation) -> !pdl.operation
+    %1 = cast %0 : !pdl.operation to !transform.op<"scf.forall">
+    %2 = share_forall_operands %1 share_operands = [0] : (!transform.op<"scf.forall">) -> !transform.op<"scf.forall">
+  }
+}
+// ---BEGIN common_ext_2_sugar_transformed---
+module {
+  func.func @promote() {
+    %cst = arith.constant 0.000000e+00 : f32
+    %0 = tensor.empty() : tensor<16x128xf32>
+    %1 = linalg.fill ins(%cst : f32) outs(%0 : tensor<16x128xf32>) -> tensor<16x128xf32>
+    %2 = scf.forall (%arg0, %arg1) in (16, 32) shared_outs(%arg2 = %1) -> (tensor<16x128xf32>) {
+      %c4 = arith.constant 4 : index
+      %3 = arith.muli %c4, %arg1 : index
+      %extracted_slice = tensor.extract_slice %arg2[%arg0, %3] [1, 4] [1, 1] : tensor<16x128xf32> to tensor<1x4xf32>
+      %extracted_slice_0 = tensor.extract_slice %arg2[%arg0, %3] [1, 4] [1, 1] : tensor<16x128xf32> to tensor<1x4xf32>
+      %4 = linalg.elemwise_binary {cast = #linalg.type_fn<cast_signed>, fun = #linalg.binary_fn<add>} ins(%extracted_slice, %extracted_slice : tensor<1x4xf32>, tensor<1x4xf32>) outs(%extracted_slice_0 : tensor<1x4xf32>) -> tensor<1x4xf32>
+      scf.forall.in_parallel {
+        tensor.parallel_insert_slice %4 into %arg2[%arg0, %3] [1, 4] [1, 1] : tensor<1x4xf32> into tensor<16x128xf32>
+      }
+    }
+    return
+  }
+}
@@ -162,6 +162,39 @@ class TestLoops:
         check_correct(correct, module)
         mlir_gc()
 
+    def test_find_ops_op_name(self):
+        mlir_gc()
+        with mlir_mod_ctx(
+            dedent(
+                """\
+            func.func @nested(%A: memref<10x10xf32>) {
+              %cst = arith.constant 1.0 : f32
+              affine.for %i = 0 to 10 {
+                affine.for %j = 0 to 10 {
+                  affine.store %cst, %A[%i, %j] : memref<10x10xf32>
+                } {inner}
+              }
+              return
+            }
+            """
+            )
+        ) as module:
+            pass
+
+        fors = find_ops(module, op_name="affine.for")
+        assert len(fors) == 2
+        assert all(op.name == "affine.for" for op in fors)
+        assert fors == find_ops(module, lambda op: op.name == "affine.for")
+
+        inner = find_ops(module, lambda op: "inner" in op.attributes, "affine.for")
+        assert len(inner) == 1
+        assert inner[0] in fors
+
+        assert not find_ops(
+            module, lambda op: op.name == "arith.constant", op_name="affine.for"
+        )
+        mlir_gc()
+
     def test_skewing(self):
         mlir_gc()
         with mlir_mod_ctx() as module:
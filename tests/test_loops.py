@@ -1,7 +1,12 @@
+import os
+import tempfile
 from textwrap import dedent
 
+import pytest
+
 from nelli.mlir.affine import (
     affine_range,
+    affine_for,
     end_for as affine_endfor,
     RankedAffineMemRefValue as AffineMemRef,
 )
@@ -15,7 +20,7 @@ from nelli.mlir.scf import (
     scf_endif,
     par_range as parfor,
 )
-from nelli.mlir.utils import run_pipeline, F32, F64, Index
+from nelli.mlir.utils import run_pipeline, F32, F64, Index, NelliMlirCompilerError
 from nelli.utils import mlir_mod_ctx
 from util import check_correct
 
@@ -56,6 +61,41 @@ class TestLoops:
         )
         check_correct(correct, module)
 
+    def test_affine_for_context_manager(self):
+        with mlir_mod_ctx() as module:
+
+            @mlir_func(rewrite_ast_=False)
+            def double_loop(M: Index, N: Index):
+                two = constant(1.0)
+                mem = AffineMemRef.alloca([10, 10], F64)
+                with affine_for(1, 10, 1) as i:
+                    with affine_for(1, 10, 1) as j:
+                        v = mem[i, j]
+                        w = v * two
+                        mem[i, j] = w
+                    mem[i, i] = two
+
+        correct = dedent(
+            """\
+        module {
+          func.func @double_loop(%arg0: index, %arg1: index) {
+            %cst = arith.constant 1.000000e+00 : f64
+            %alloca = memref.alloca() : memref<10x10xf64>
+            affine.for %arg2 = 1 to 10 {
+              affine.for %arg3 = 1 to 10 {
+                %1 = affine.load %0[%arg2, %arg3] : memref<10x10xf64>
+                %2 = arith.mulf %1, %cst : f64
+                affine.store %2, %0[%arg2, %arg3] : memref<10x10xf64>
+              }
+              affine.store %cst, %0[%arg2, %arg2] : memref<10x10xf64>
+            }
+            return
+          }
+        }
+        """
+        )
+        check_correct(correct, module)
+
     def test_with_rewriting_ast1(self):
         with mlir_mod_ctx() as module:
 
@@ -417,3 +457,39 @@ class TestLoops:
         """
         )
         check_correct(correct, module)
+
+    def test_run_pipeline_error_report(self, monkeypatch):
+        src = dedent(
+            """\
+        func.func @empty() {
+          return
+        }
+        """
+        )
+        filename = os.path.join(tempfile.gettempdir(), "UnnammedModule.mlir")
+        pipeline = "builtin.module(not-a-real-pass)"
+
+        monkeypatch.setenv("NELLI_CAPTURE_PRE_IR", "1")
+        with mlir_mod_ctx(src) as module:
+            with pytest.raises(NelliMlirCompilerError) as exc_info:
+                run_pipeline(module, pipeline)
+        message = str(exc_info.value)
+        assert "UnnammedModule compile failed" in message
+        assert "$ mlir-opt " in message
+        assert f"-pass-pipeline='{pipeline}' {filename}" in message
+        assert "Rerun with NELLI_CAPTURE_PRE_IR=1" not in message
+        with open(filename) as f:
+            assert "func.func @empty()" in f.read()
+
+        monkeypatch.delenv("NELLI_CAPTURE_PRE_IR")
+        with mlir_mod_ctx(src) as module:
+            with pytest.raises(NelliMlirCompilerError) as exc_info:
+                run_pipeline(module, pipeline)
+        message = str(exc_info.value)
+        assert "UnnammedModule compile failed" in message
+        assert "mlir-opt" not in message
+        assert (
+            "the IR after the failure (possibly partially lowered) was\n"
+            f"written to {filename}."
+        ) in message
+        assert "Rerun with NELLI_CAPTURE_PRE_IR=1" in message
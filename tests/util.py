@@ -1,15 +1,28 @@
 import difflib
 import re
+from functools import lru_cache
 from textwrap import dedent
 
+_SSA_NAMES = re.compile(r"([%#@]\w+)|(\^bb\d+)|(0x\w+)")
+
+
+def _normalize(ir):
+    return tuple(dedent(_SSA_NAMES.sub("%DONT_CARE", ir)).splitlines())
+
+
+# expected IR strings are module-level constants, so normalize each one once
+_normalize_expected = lru_cache(maxsize=None)(_normalize)
+
 
 def check_correct(correct, module):
-    correct = dedent(re.sub(r"([%#@]\w+)|(\^bb\d+)|(0x\w+)", "%DONT_CARE", correct))
-    module = dedent(re.sub(r"([%#@]\w+)|(\^bb\d+)|(0x\w+)", "%DONT_CARE", str(module)))
+    correct = _normalize_expected(correct)
+    module = _normalize(str(module))
+    if correct == module:
+        return
     diff = list(
         difflib.unified_diff(
-            correct.splitlines(),
-            module.splitlines(),
+            correct,
+            module,
             lineterm="",
         )
     )